@@ -3,9 +3,11 @@ Slack API client with rate limiting and error handling.
 """
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
@@ -18,12 +20,14 @@ class SlackClient:
     Slack API client with rate limiting and error handling.
     """
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, max_concurrent_requests: int = 10):
         """
         Initialize Slack client.
 
         Args:
             token: Slack API token. If not provided, uses SLACK_BOT_TOKEN env var.
+            max_concurrent_requests: Maximum number of Slack API requests in
+                flight at once across all threads using this client (default: 10)
         """
         if token is None:
             token = os.environ.get("SLACK_BOT_TOKEN")
@@ -31,6 +35,10 @@ class SlackClient:
             raise ValueError("Must specify token or set SLACK_BOT_TOKEN env var")
 
         self.client = WebClient(token=token)
+        self.max_concurrent_requests = max_concurrent_requests
+        # Shared by every caller, so concurrently processed days together
+        # stay within the limit
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
         self._validate_auth()
 
     def _validate_auth(self) -> None:
@@ -51,6 +59,27 @@ class SlackClient:
         else:
             raise
 
+    def _call(self, method: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Call a Slack API method, retrying when rate limited.
+
+        The request holds a slot of the client-wide limiter while in flight;
+        the slot is released while waiting out a rate limit.
+
+        Args:
+            method: WebClient method to call
+            **kwargs: Arguments for the method
+
+        Returns:
+            Slack API response
+        """
+        while True:
+            try:
+                with self._request_slots:
+                    return method(**kwargs)
+            except SlackApiError as e:
+                self._handle_rate_limit(e)
+
     def get_conversation_threads(self, channel_id: str, date: datetime) -> List[List[Dict[str, Any]]]:
         """
         Get all conversation threads from a channel for a specific date.
@@ -67,31 +96,37 @@ class SlackClient:
         next_day = date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
         end_ts = next_day.replace(tzinfo=timezone.utc).timestamp()
 
-        threads = []
+        thread_timestamps = []
         try:
             # Get all messages for the day
+            cursor = None
             while True:
-                try:
-                    result = self.client.conversations_history(
-                        channel=channel_id,
-                        oldest=str(start_ts),
-                        latest=str(end_ts)
-                    )
-                    messages = result["messages"]
-
-                    # Process each thread
-                    for message in messages:
-                        if message.get("thread_ts"):  # Only process threads
-                            thread = self._get_thread_replies(channel_id, message["thread_ts"])
-                            if thread:
-                                threads.append(thread)
-
-                    if not result["has_more"]:
-                        break
-
-                except SlackApiError as e:
-                    self._handle_rate_limit(e)
-                    continue
+                result = self._call(
+                    self.client.conversations_history,
+                    channel=channel_id,
+                    oldest=str(start_ts),
+                    latest=str(end_ts),
+                    cursor=cursor,
+                )
+                messages = result["messages"]
+
+                # Collect thread parents; replies are fetched below
+                for message in messages:
+                    if message.get("thread_ts"):  # Only process threads
+                        thread_timestamps.append(message["thread_ts"])
+
+                cursor = result.get("response_metadata", {}).get("next_cursor")
+                if not result["has_more"] or not cursor:
+                    break
+
+            # Fetch all thread replies for the day concurrently; the shared
+            # limiter bounds the requests actually in flight
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+                replies = executor.map(
+                    lambda thread_ts: self._get_thread_replies(channel_id, thread_ts),
+                    thread_timestamps,
+                )
+                threads = [thread for thread in replies if thread]
 
         except Exception as e:
             logger.error(f"Error getting conversations: {str(e)}")
@@ -111,17 +146,12 @@ class SlackClient:
             List of messages in the thread, or None if error
         """
         try:
-            while True:
-                try:
-                    result = self.client.conversations_replies(
-                        channel=channel_id,
-                        ts=thread_ts
-                    )
-                    return result["messages"]
-
-                except SlackApiError as e:
-                    self._handle_rate_limit(e)
-                    continue
+            result = self._call(
+                self.client.conversations_replies,
+                channel=channel_id,
+                ts=thread_ts
+            )
+            return result["messages"]
 
         except Exception as e:
             logger.error(f"Error getting thread replies: {str(e)}")
@@ -138,14 +168,8 @@ class SlackClient:
             User information dictionary or None if error
         """
         try:
-            while True:
-                try:
-                    result = self.client.users_info(user=user_id)
-                    return result["user"]
-
-                except SlackApiError as e:
-                    self._handle_rate_limit(e)
-                    continue
+            result = self._call(self.client.users_info, user=user_id)
+            return result["user"]
 
         except Exception as e:
             logger.error(f"Error getting user info: {str(e)}")
@@ -2,12 +2,19 @@
 Configuration for Slack channels.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import yaml
 from pydantic import BaseModel, Field
 
+# Use the LibYAML-based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 
 class SlackChannel(BaseModel):
     """Represents a Slack channel configuration."""
@@ -22,6 +29,26 @@ class ChannelList(BaseModel):
     channels: List[SlackChannel]
 
 
+@lru_cache(maxsize=8)
+def _load_channel_list(config_path: str, mtime: float) -> ChannelList:
+    """
+    Load and validate a channels file.
+
+    Cached per path and modification time, so an unchanged file is parsed
+    only once while edits are still picked up.
+
+    Args:
+        config_path: Path to the channels.yaml file
+        mtime: Modification time of the file, used as part of the cache key
+
+    Returns:
+        Validated channel list
+    """
+    with open(config_path, 'r') as f:
+        config_dict = yaml.load(f, Loader=YamlLoader)
+    return ChannelList(**config_dict)
+
+
 class ChannelConfig:
     """Configuration for Slack channels to monitor."""
 
@@ -45,9 +72,13 @@ class ChannelConfig:
             )
 
         # Load and validate configuration
-        with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
-            self._config = ChannelList(**config_dict)
+        config_path = str(config_path)
+        self._config = _load_channel_list(config_path, os.path.getmtime(config_path))
+
+        # Index channels by ID for constant-time lookups
+        self._by_id: Dict[str, SlackChannel] = {
+            channel.id: channel for channel in self._config.channels
+        }
 
     @property
     def channels(self) -> List[SlackChannel]:
@@ -77,10 +108,10 @@ class ChannelConfig:
         Raises:
             ValueError: If channel_id is not found in configuration
         """
-        for channel in self.channels:
-            if channel.id == channel_id:
-                return channel
-        raise ValueError(f"Channel {channel_id} not found in configuration")
+        channel = self._by_id.get(channel_id)
+        if channel is None:
+            raise ValueError(f"Channel {channel_id} not found in configuration")
+        return channel
 
     def get_channel_name(self, channel_id: str) -> str:
         """
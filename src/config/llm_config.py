@@ -2,8 +2,11 @@
 Configuration for LLM and vector store components.
 """
 
+import atexit
 import os
+import socket
 
+import httpx
 from dotenv import load_dotenv
 from llama_index.core import Settings
 from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
@@ -11,7 +14,7 @@ from llama_index.llms.azure_openai import AzureOpenAI
 from llama_index.storage.docstore.redis import RedisDocumentStore
 from llama_index.storage.kvstore.redis import RedisKVStore
 from llama_index.vector_stores.redis import RedisVectorStore
-from redis import Redis
+from redis import ConnectionPool, Redis
 from redisvl.schema import IndexSchema
 
 
@@ -29,23 +32,62 @@ class LLMConfig:
         self.azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         self.embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
         self.llm_deployment = os.getenv("AZURE_OPENAI_LLM_DEPLOYMENT")
+        self.embedding_batch_size = int(os.getenv("AZURE_EMBEDDING_BATCH_SIZE", "100"))
+        # Only text-embedding-3 models accept reduced dimensions; when unset the
+        # model's native size is used (1536 for ada-002/text-embedding-3-small)
+        embedding_dimensions = os.getenv("AZURE_OPENAI_EMBEDDING_DIMENSIONS")
+        self.embedding_dimensions = int(embedding_dimensions) if embedding_dimensions else None
 
         # Redis Configuration
         self.redis_host = os.getenv("REDIS_HOST", "localhost")
         self.redis_port = int(os.getenv("REDIS_PORT", "6379"))
         self.redis_password = os.getenv("REDIS_PASSWORD", "")
+        self.redis_max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+        self.redis_write_batch_size = int(os.getenv("REDIS_WRITE_BATCH_SIZE", "100"))
 
-        # Initialize Redis client
-        self.redis_client = Redis(
+        # Shared HTTP client so the LLM and embedding clients reuse pooled
+        # HTTP/2 connections instead of reconnecting per request
+        self.http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        )
+        atexit.register(self.http_client.close)
+
+        # Initialize Redis client on a bounded connection pool shared by the
+        # vector, document and cache stores. TCP keepalive and periodic health
+        # checks detect connections dropped while idle between sweeps
+        self.redis_pool = ConnectionPool(
             host=self.redis_host,
             port=self.redis_port,
             password=self.redis_password,
             decode_responses=False,  # Required for vector store binary data
+            max_connections=self.redis_max_connections,
+            socket_keepalive=True,
+            socket_keepalive_options=self._keepalive_options(),
+            health_check_interval=30,
         )
+        self.redis_client = Redis(connection_pool=self.redis_pool)
+
+        # Redis index schema, built on first use
+        self._redis_schema = None
 
         Settings.embed_model = self.get_embedding_model()
         Settings.llm = self.get_llm_model()
 
+    @staticmethod
+    def _keepalive_options() -> dict:
+        """Get TCP keepalive timings supported by the platform."""
+        options = {
+            "TCP_KEEPIDLE": 60,
+            "TCP_KEEPINTVL": 30,
+            "TCP_KEEPCNT": 3,
+        }
+        return {
+            getattr(socket, name): value
+            for name, value in options.items()
+            if hasattr(socket, name)
+        }
+
     def get_embedding_model(self) -> AzureOpenAIEmbedding:
         """Get Azure OpenAI embedding model."""
         Settings.embed_model = AzureOpenAIEmbedding(
@@ -54,6 +96,9 @@ class LLMConfig:
             api_key=self.api_key,
             azure_endpoint=self.azure_endpoint,
             api_version=self.embedding_api_version,
+            embed_batch_size=self.embedding_batch_size,
+            dimensions=self.embedding_dimensions,
+            http_client=self.http_client,
         )
         return Settings.embed_model
 
@@ -65,11 +110,18 @@ class LLMConfig:
             api_key=self.api_key,
             azure_endpoint=self.azure_endpoint,
             api_version=self.llm_api_version,
+            http_client=self.http_client,
         )
         return Settings.llm
 
     def get_redis_schema(self) -> IndexSchema:
-        """Get Redis schema for vector store."""
+        """Get Redis schema for vector store, built once per configuration."""
+        if self._redis_schema is None:
+            self._redis_schema = self._build_redis_schema()
+        return self._redis_schema
+
+    def _build_redis_schema(self) -> IndexSchema:
+        """Build Redis schema for vector store."""
         return IndexSchema.from_dict(
             {
                 # Basic index configuration
@@ -96,7 +148,7 @@ class LLMConfig:
                         "type": "vector",
                         "name": "vector",
                         "attrs": {
-                            "dims": 1536,  # Azure OpenAI ada-002 dimension
+                            "dims": self.embedding_dimensions or 1536,
                             "algorithm": "hnsw",
                             "distance_metric": "cosine",
                         },
@@ -115,8 +167,13 @@ class LLMConfig:
 
     def get_document_store(self) -> RedisDocumentStore:
         """Get Redis document store."""
-        return RedisDocumentStore.from_redis_client(
-            redis_client=self.redis_client, namespace="slack_docs"
+        # The docstore writes nodes, metadata and hashes through Redis
+        # pipelines flushed every batch_size entries; the default of 1 costs
+        # a round-trip per entry
+        return RedisDocumentStore(
+            RedisKVStore.from_redis_client(redis_client=self.redis_client),
+            namespace="slack_docs",
+            batch_size=self.redis_write_batch_size,
         )
 
     def get_cache_store(self) -> RedisKVStore:
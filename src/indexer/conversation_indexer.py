@@ -2,12 +2,12 @@
 Main orchestrator for the Slack conversation indexing system.
 """
 
-import hashlib
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-
-from llama_index.core import Document
+from typing import List, Dict, Optional, Tuple
 
 from src.client.slack_client import SlackClient
 from src.config.channel_config import ChannelConfig
@@ -30,6 +30,8 @@ class ConversationIndexer:
         conversation_processor: ConversationProcessor,
         monitored_channels: List[str],
         channel_config: ChannelConfig,
+        max_workers: int = 8,
+        vectorize_batch_size: int = 32,
     ):
         """
         Initialize the conversation indexer.
@@ -40,67 +42,40 @@ class ConversationIndexer:
             conversation_processor: Initialized ConversationProcessor
             monitored_channels: List of channel IDs to monitor
             channel_config: Channel configuration
+            max_workers: Number of days processed concurrently (default: 8)
+            vectorize_batch_size: Number of conversations vectorized per batch (default: 32)
         """
         self.slack_client = slack_client
         self.conversation_store = conversation_store
         self.conversation_processor = conversation_processor
         self.monitored_channels = monitored_channels
         self.channel_config = channel_config
+        self.max_workers = max_workers
+        self.vectorize_batch_size = vectorize_batch_size
 
-    def _prepare_conversation_metadata(
-        self, conversation: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Prepare metadata for conversation indexing."""
-        channel = self.channel_config.get_channel_by_id(conversation["channel_id"])
-        return {
-            "thread_ts": conversation["thread_ts"],
-            "channel_id": channel.id,
-            "channel_name": channel.name,
-            "channel_description": channel.description,
-            "participant_count": conversation["participant_count"],
-            "date": conversation["date"].isoformat(),
-            "last_updated": conversation["last_updated"].isoformat(),
-        }
-
-    def process_conversation(self, conversation: ConversationData) -> None:
-        """
-        Process a single conversation.
-
-        Args:
-            conversation: ConversationData instance
-        """
-        try:
-            # Get a database session
-            session = self.conversation_store.Session()
-
-            try:
-                # Store conversation in database
-                self.conversation_store.store_conversation(session, conversation)
-
-                # Process conversation for vector search
-                self.conversation_processor.process_conversation(conversation)
-
-                logger.info(
-                    f"Processed conversation from {conversation.channel_name} "
-                    f"with {len(conversation.content.split())} words"
-                )
-            finally:
-                session.close()
-        except Exception as e:
-            logger.error(f"Error processing conversation: {e}")
-            raise
-
-    def process_channel_for_date(self, channel_id: str, date: datetime, session) -> int:
+    def process_channel_for_date(
+        self,
+        channel_id: str,
+        date: datetime,
+        session,
+        force_update: bool = False,
+    ) -> Tuple[int, List[ConversationData]]:
         """
         Process all conversations in a channel for a specific date.
 
+        The day's conversations and its processed marker are written in the
+        caller's transaction; vectorizing the returned conversations is left
+        to the caller, so no database transaction is held open while embedding.
+
         Args:
             channel_id: Channel ID to process
             date: Date to process
             session: Database session
+            force_update: Whether to vectorize unchanged conversations too
 
         Returns:
-            Number of conversations processed
+            Number of conversations processed and the conversations that
+            need vectorizing
 
         Raises:
             ValueError: If channel is not found in config
@@ -114,87 +89,93 @@ class ConversationIndexer:
 
             if not channel.enabled:
                 logger.info(f"Skipping disabled channel: {channel_id}")
-                return 0
+                return 0, []
+
+            channel_name = channel.name
+            date_str = date.strftime('%Y-%m-%d')
 
             logger.info(
-                f"Processing channel: {channel.name} ({channel_id}) for {date.strftime('%Y-%m-%d')}"
+                f"Processing channel: {channel_name} ({channel_id}) for {date_str}"
             )
 
             # Get all threads for the day
             threads = self.slack_client.get_conversation_threads(channel_id, date)
             if not threads:
                 logger.info(
-                    f"No threads found in {channel.name} for {date.strftime('%Y-%m-%d')}"
+                    f"No threads found in {channel_name} for {date_str}"
                 )
                 self.conversation_store.mark_day_processed(
                     session,
                     channel_id,
                     date,
-                    channel_name=channel.name,  # Pass channel name from config
+                    channel_name=channel_name,  # Pass channel name from config
                 )
-                return 0
+                return 0, []
 
-            processed_count = 0
+            conversations = []
             try:
                 for thread in threads:
                     message = thread[0]  # First message is the parent
                     thread_ts = message["thread_ts"]
 
-                    # Create user mapping for this thread
-                    user_map = {}
-                    for msg in thread:
-                        user_id = msg.get("user", "Unknown")
-                        if user_id and user_id not in user_map:
-                            user_map[user_id] = f"User_{len(user_map) + 1}"
+                    # Map user IDs to anonymous names as they first appear,
+                    # with a single dict operation per message
+                    user_map: Dict[str, str] = {}
 
-                    # Build conversation content in LLM-friendly format
-                    content_parts = []
+                    def name_for(user_id: str) -> str:
+                        return user_map.setdefault(user_id, f"User_{len(user_map) + 1}")
 
-                    # First message is the conversation starter
-                    starter = user_map[thread[0].get("user", "Unknown")]
-                    content_parts.append(
-                        f"{starter} started a topic with: {thread[0]['text']}"
-                    )
-
-                    # Add replies
-                    if len(thread) > 1:
-                        for msg in thread[1:]:
-                            user = user_map[msg.get("user", "Unknown")]
-                            content_parts.append(f"{user} replied with: {msg['text']}")
-
-                    content = "\n".join(content_parts)
+                    # Build conversation content in LLM-friendly format: the
+                    # first message is the conversation starter, then replies
+                    starter = name_for(message.get("user", "Unknown"))
+                    content = "\n".join([
+                        f"{starter} started a topic with: {message['text']}",
+                        *(
+                            f"{name_for(msg.get('user', 'Unknown'))} replied with: {msg['text']}"
+                            for msg in thread[1:]
+                        ),
+                    ])
 
                     # Create conversation data
-                    conversation = ConversationData(
+                    conversations.append(ConversationData(
                         thread_ts=thread_ts,
                         channel_id=channel_id,
-                        channel_name=channel.name,
+                        channel_name=channel_name,
                         content=content,
                         participant_count=len(user_map),
-                        date=datetime.fromtimestamp(float(message["ts"])),
+                        # Truncate to the stored day, as retried conversations carry it
+                        date=datetime.fromtimestamp(float(message["ts"])).replace(
+                            hour=0, minute=0, second=0, microsecond=0
+                        ),
                         last_updated=datetime.now(),
                         content_hash=None,  # Will be computed by conversation store
-                    )
+                    ))
 
-                    self.process_conversation(conversation)
-                    processed_count += 1
+                # Store the whole day with a single upsert
+                changed = self.conversation_store.bulk_upsert_conversations(
+                    session, conversations
+                )
 
-                # Mark day as processed only if all threads were processed successfully
+                # Mark day as processed only if all threads were processed successfully.
+                # It is committed together with the day's conversations.
                 self.conversation_store.mark_day_processed(
                     session,
                     channel_id,
                     date,
-                    channel_name=channel.name,  # Pass channel name from config
+                    channel_name=channel_name,  # Pass channel name from config
                 )
                 logger.info(
-                    f"Successfully processed {processed_count} threads from {channel.name} "
-                    f"for {date.strftime('%Y-%m-%d')}"
+                    f"Successfully processed {len(conversations)} threads from {channel_name} "
+                    f"for {date_str}"
                 )
-                return processed_count
+                # Only new or changed conversations need vectorizing, unless
+                # an update is forced
+                to_vectorize = conversations if force_update else changed
+                return len(conversations), to_vectorize
 
             except Exception as e:
                 logger.error(
-                    f"Error processing threads in {channel.name} for {date.strftime('%Y-%m-%d')}: {e}"
+                    f"Error processing threads in {channel_name} for {date_str}: {e}"
                 )
                 raise
 
@@ -202,6 +183,79 @@ class ConversationIndexer:
             logger.error(f"Error processing channel {channel_id} for date {date}: {e}")
             raise
 
+    def _process_day(
+        self,
+        channel_id: str,
+        date: datetime,
+        vectorize_queue: queue.Queue,
+        force_update: bool,
+    ) -> int:
+        """
+        Process a single channel day in its own database session.
+
+        Sessions are not thread-safe, so every worker opens its own. The day
+        is committed and the session closed before its conversations are
+        queued: a put blocked on a full queue must not hold the database
+        write lock other day workers are waiting for.
+
+        Args:
+            channel_id: Channel ID to process
+            date: Date to process
+            vectorize_queue: Queue consumed by the vectorization worker
+            force_update: Whether to vectorize unchanged conversations too
+
+        Returns:
+            Number of conversations processed
+        """
+        logger.debug(f"Processing date: {date.strftime('%Y-%m-%d')}")
+        with self.conversation_store.session_scope() as session:
+            processed_count, to_vectorize = self.process_channel_for_date(
+                channel_id, date, session, force_update
+            )
+
+        for conversation in to_vectorize:
+            vectorize_queue.put(conversation)
+        return processed_count
+
+    def _vectorize_worker(
+        self, vectorize_queue: queue.Queue, errors: List[Exception]
+    ) -> None:
+        """
+        Vectorize queued conversations in batches until a None sentinel arrives.
+
+        Successfully vectorized conversations are recorded in the store, so
+        ones whose vectorization failed are retried by a later run. Errors are
+        recorded rather than raised so the queue keeps draining and producers
+        never block on a full queue.
+
+        Args:
+            vectorize_queue: Queue of ConversationData instances
+            errors: List collecting vectorization errors
+        """
+        done = False
+        while not done:
+            # Block for the first conversation, then take whatever else is ready
+            batch = []
+            conversation = vectorize_queue.get()
+            while conversation is not None:
+                batch.append(conversation)
+                if len(batch) >= self.vectorize_batch_size:
+                    break
+                try:
+                    conversation = vectorize_queue.get_nowait()
+                except queue.Empty:
+                    break
+            done = conversation is None
+
+            if batch:
+                try:
+                    self.conversation_processor.process_conversations(batch)
+                    with self.conversation_store.session_scope() as session:
+                        self.conversation_store.mark_vectorized(session, batch)
+                except Exception as e:
+                    logger.error(f"Error vectorizing conversations: {e}")
+                    errors.append(e)
+
     def process_time_period(
         self,
         start_date: datetime,
@@ -213,6 +267,11 @@ class ConversationIndexer:
         """
         Process conversations for a given time period.
 
+        Days of all channels are processed concurrently on a thread pool since
+        each one is dominated by Slack API round-trips. Stored conversations are handed to
+        a vectorization worker thread through a bounded queue, so embedding
+        overlaps with ingestion.
+
         Args:
             start_date: Start date to process from
             end_date: End date to process to
@@ -220,64 +279,117 @@ class ConversationIndexer:
             continuous_mode: Whether running in continuous mode
             channel: Optional channel ID to process
         """
-        # Step 1: Ingest conversations from Slack
-        logger.info("\nStep 1: Ingesting conversations from Slack...")
+        logger.info("\nIngesting and vectorizing conversations from Slack...")
 
-        # Use specified channel or all monitored channels
-        channels_to_process = [channel] if channel else self.monitored_channels
+        # Use specified channel or all monitored channels, without duplicates
+        channels_to_process = list(
+            dict.fromkeys([channel] if channel else self.monitored_channels)
+        )
 
+        # Fail fast on unknown channels before any work is scheduled
         for channel_id in channels_to_process:
-            logger.info(f"Processing channel: {channel_id}")
-            processed_count = 0
-            skipped_count = 0
-
-            current_date = start_date
-            while current_date < end_date:
-                with self.conversation_store.Session() as session:
-                    should_process = (
-                        continuous_mode  # Always process in continuous mode
-                        or force_update  # Process if force update is requested
-                        or not self.conversation_store.is_day_processed(
-                            session, channel_id, current_date
-                        )  # Process if not already done
-                    )
+            self.channel_config.get_channel_by_id(channel_id)
+
+        dates = []
+        current_date = start_date
+        while current_date < end_date:
+            dates.append(current_date)
+            current_date += timedelta(days=1)
+
+        # Look up already processed days of all channels in one query
+        processed_days = {}
+        if not (continuous_mode or force_update):
+            with self.conversation_store.session_scope() as session:
+                processed_days = self.conversation_store.get_processed_days(
+                    session, channels_to_process, start_date, end_date
+                )
 
-                    if should_process:
-                        logger.debug(
-                            f"Processing date: {current_date.strftime('%Y-%m-%d')}"
-                        )
-                        processed = self.process_channel_for_date(
-                            channel_id, current_date, session
+        # Skipped days are not fetched again, so retry the conversations on
+        # them whose vectorization failed in an earlier run
+        pending = []
+        if processed_days:
+            with self.conversation_store.session_scope() as session:
+                for channel_id in channels_to_process:
+                    channel_days = processed_days.get(channel_id)
+                    if not channel_days:
+                        continue
+                    pending.extend(
+                        conversation
+                        for conversation in self.conversation_store.get_conversations(
+                            session, start_date, end_date, channel_id,
+                            unvectorized_only=True,
                         )
-                        processed_count += processed
-                    else:
-                        skipped_count += 1
-                        logger.debug(
-                            f"Skipping date: {current_date.strftime('%Y-%m-%d')} (already processed)"
-                        )
-
-                current_date += timedelta(days=1)
-
-            # Only show skipped count in date-range mode
-            if continuous_mode:
-                logger.info(
-                    f"Channel {channel_id} summary: processed {processed_count} conversations"
-                )
-            else:
+                        if conversation.date.date() in channel_days
+                    )
+            if pending:
                 logger.info(
-                    f"Channel {channel_id} summary: processed {processed_count} conversations, "
-                    f"skipped {skipped_count} days"
+                    f"Retrying vectorization of {len(pending)} conversations "
+                    f"from already processed days"
                 )
 
-        # Step 2: Vectorize conversations
-        logger.info("\nStep 2: Vectorizing conversations...")
-        with self.conversation_store.Session() as session:
-            conversations = self.conversation_store.get_conversations(
-                session, start_date=start_date, end_date=end_date, channel_id=channel
-            )
+        vectorize_queue = queue.Queue(maxsize=self.vectorize_batch_size * 8)
+        vectorize_errors: List[Exception] = []
+        vectorizer = threading.Thread(
+            target=self._vectorize_worker,
+            args=(vectorize_queue, vectorize_errors),
+            name="vectorizer",
+            daemon=True,
+        )
+        vectorizer.start()
+
+        processed_counts = dict.fromkeys(channels_to_process, 0)
+        skipped_counts = dict.fromkeys(channels_to_process, 0)
+
+        try:
+            for conversation in pending:
+                vectorize_queue.put(conversation)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Schedule the days of all channels at once, so channels are
+                # processed concurrently rather than one after another
+                futures = {}
+                for channel_id in channels_to_process:
+                    logger.info(f"Processing channel: {channel_id}")
+                    for date in dates:
+                        if date.date() in processed_days.get(channel_id, ()):
+                            skipped_counts[channel_id] += 1
+                            logger.debug(
+                                f"Skipping date: {date.strftime('%Y-%m-%d')} (already processed)"
+                            )
+                            continue
+
+                        future = executor.submit(
+                            self._process_day,
+                            channel_id,
+                            date,
+                            vectorize_queue,
+                            force_update,
+                        )
+                        futures[future] = channel_id
+
+                for future in as_completed(futures):
+                    try:
+                        processed_counts[futures[future]] += future.result()
+                    except Exception:
+                        # Stop at the first failed day instead of fetching the rest
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise
+
+            for channel_id in channels_to_process:
+                # Only show skipped count in date-range mode
+                if continuous_mode:
+                    logger.info(
+                        f"Channel {channel_id} summary: processed {processed_counts[channel_id]} conversations"
+                    )
+                else:
+                    logger.info(
+                        f"Channel {channel_id} summary: processed {processed_counts[channel_id]} conversations, "
+                        f"skipped {skipped_counts[channel_id]} days"
+                    )
+        finally:
+            # Let the worker finish the remaining conversations and exit
+            vectorize_queue.put(None)
+            vectorizer.join()
 
-            for conversation in conversations:
-                logger.info(f"Vectorizing {len(conversation.thread_ts)} conversation...")
-                self.conversation_processor.process_conversation(conversation)
-            else:
-                logger.info("No new conversations to vectorize")
+        if vectorize_errors:
+            raise vectorize_errors[0]
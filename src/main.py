@@ -3,10 +3,11 @@ Main entry point for the Slack conversation indexer.
 """
 
 import argparse
+import asyncio
 import logging
 import os
-import time
-from datetime import datetime, timedelta
+import signal
+from datetime import date, datetime, time, timedelta
 
 from dotenv import load_dotenv
 
@@ -42,10 +43,11 @@ def process_date_range(
         force_update: Whether to force update already processed days
         channel: Optional channel ID to process
     """
+    today = datetime.combine(date.today(), time.min)
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = today - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
+        end_date = today
 
     start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -66,6 +68,50 @@ def process_date_range(
     logger.info("Processing complete!")
 
 
+async def run_continuous(
+        indexer: ConversationIndexer,
+        force_update: bool = False,
+        channel: str = None,
+        interval: int = 300,
+) -> None:
+    """
+    Continuously process the last day of conversations until stopped.
+
+    Processing runs in a worker thread so the event loop stays free to react
+    to SIGINT/SIGTERM, which stop the loop after the current pass.
+
+    Args:
+        indexer: ConversationIndexer instance
+        force_update: Whether to force update already processed days
+        channel: Optional channel ID to process
+        interval: Seconds to wait between passes (default: 5 minutes)
+    """
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    while not stop_event.is_set():
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=1)
+        await asyncio.to_thread(
+            indexer.process_time_period,
+            start_date,
+            end_date,
+            force_update=force_update,
+            continuous_mode=True,
+            channel=channel,
+        )
+
+        # Wait before the next check, waking early on shutdown
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+    logger.info("Stopped continuous monitoring")
+
+
 def main():
     """Main CLI interface."""
     parser = argparse.ArgumentParser(
@@ -79,10 +125,12 @@ def main():
     )
     parser.add_argument(
         "--start-date",
+        type=date.fromisoformat,
         help="Start date for date range mode (YYYY-MM-DD)",
     )
     parser.add_argument(
         "--end-date",
+        type=date.fromisoformat,
         help="End date for date range mode (YYYY-MM-DD)",
     )
     parser.add_argument(
@@ -94,6 +142,12 @@ def main():
         "--channel",
         help="Process a specific channel (channel ID)",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Number of days to process concurrently (default: 8)",
+    )
 
     args = parser.parse_args()
 
@@ -113,25 +167,22 @@ def main():
         conversation_processor=conversation_processor,
         monitored_channels=channel_config.enabled_channel_ids,
         channel_config=channel_config,  # Pass channel config for metadata
+        max_workers=args.max_workers,
     )
 
     if args.mode == "continuous":
         logger.info("Starting continuous monitoring...")
-        while True:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=1)
-            indexer.process_time_period(
-                start_date,
-                end_date,
+        asyncio.run(
+            run_continuous(
+                indexer,
                 force_update=args.force_update,
-                continuous_mode=True,
                 channel=args.channel,
             )
-            time.sleep(300)  # Wait 5 minutes before next check
+        )
     else:
         if args.start_date and args.end_date:
-            start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
-            end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+            start_date = datetime.combine(args.start_date, time.min)
+            end_date = datetime.combine(args.end_date, time.min)
             process_date_range(
                 indexer=indexer,
                 start_date=start_date,
@@ -3,7 +3,7 @@ Process and vectorize Slack conversations for semantic search.
 """
 
 import logging
-from typing import Dict, Any
+from typing import List
 
 from llama_index.core import Document, Settings
 from llama_index.core.ingestion import (
@@ -70,34 +70,55 @@ class ConversationProcessor:
         Settings.embed_model = self.embed_model
         Settings.node_parser = self.text_splitter
 
-    def process_conversation(self, conversation: ConversationData) -> None:
+    def _create_document(self, conversation: ConversationData) -> Document:
         """
-        Process a single conversation.
+        Create a document with metadata for a conversation.
 
         Args:
             conversation: ConversationData instance
+
+        Returns:
+            Document ready for the ingestion pipeline
+        """
+        return Document(
+            text=conversation.content,
+            metadata={
+                "thread_ts": conversation.thread_ts,
+                "channel_id": conversation.channel_id,
+                "channel_name": conversation.channel_name,
+                # Epoch seconds, matching the NUMERIC "date" field of the
+                # Redis index so date ranges can be filtered server-side
+                "date": int(conversation.date.timestamp()),
+                "participant_count": conversation.participant_count,
+            },
+            doc_id=f"{conversation.channel_id}_{conversation.thread_ts}"  # Use channel_id and thread_ts as unique identifier
+        )
+
+    def process_conversations(self, conversations: List[ConversationData]) -> None:
+        """
+        Process a batch of conversations in a single pipeline run.
+
+        All chunks of the batch are embedded together, so the number of
+        embedding requests depends on the embedding batch size rather than on
+        the number of conversations.
+
+        Args:
+            conversations: List of ConversationData instances
         """
+        if not conversations:
+            return
+
         try:
-            # Create document with metadata
-            document = Document(
-                text=conversation.content,
-                metadata={
-                    "thread_ts": conversation.thread_ts,
-                    "channel_id": conversation.channel_id,
-                    "channel_name": conversation.channel_name,
-                    "date": conversation.date.isoformat(),
-                    "participant_count": conversation.participant_count,
-                },
-                doc_id=f"{conversation.channel_id}_{conversation.thread_ts}"  # Use channel_id and thread_ts as unique identifier
-            )
+            documents = [
+                self._create_document(conversation) for conversation in conversations
+            ]
 
-            # Process the document through pipeline
-            nodes = self.pipeline.run(documents=[document])
+            # Process all documents through the pipeline at once
+            nodes = self.pipeline.run(documents=documents)
             logger.info(
-                f"Processed conversation from {conversation.channel_name} "
-                f"into {len(nodes)} nodes"
+                f"Processed {len(documents)} conversations into {len(nodes)} nodes"
             )
 
         except Exception as e:
-            logger.error(f"Error processing conversation: {e}")
+            logger.error(f"Error processing conversations: {e}")
             raise
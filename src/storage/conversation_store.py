@@ -3,12 +3,14 @@ SQLite-based storage for Slack conversations with change detection.
 """
 import logging
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from datetime import date as date_type, datetime, timezone
+from typing import Any, Optional, List, Dict, Iterator, Set, Tuple, Union
 
 import blake3
-from sqlalchemy import create_engine, Column, String, DateTime, Integer, Text, Date
+from sqlalchemy import and_, bindparam, create_engine, event, inspect, lambda_stmt, or_, select, update, Column, String, DateTime, Integer, Text, Date, Index, PrimaryKeyConstraint
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
@@ -26,11 +28,39 @@ DEFAULT_DB_URL = f"sqlite:///{DEFAULT_DB_PATH}"
 # Get database URL from environment or use default
 DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_DB_URL)
 
+# Content size above which Blake3 hashes with multiple threads; below it the
+# thread startup costs more than it saves
+MULTITHREADED_HASH_THRESHOLD = 128 * 1024
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+# Connection settings for SQLite: WAL lets readers run alongside the writer
+# and, with synchronous=NORMAL, avoids an fsync on every commit. The page
+# cache is raised to 64 MB (negative sizes are in KiB)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
 Base = declarative_base()
 
 class Conversation(Base):
     """Model for storing conversations."""
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Covering index for change detection, which only reads the hashes
+        Index("ix_conv_thread_hashes", "thread_ts", "content_hash", "vectorized_hash"),
+        # Date range queries of a channel
+        Index("ix_conv_channel_date", "channel_id", "date"),
+    )
 
     thread_ts = Column(String, primary_key=True)
     channel_id = Column(String, nullable=False)
@@ -40,19 +70,44 @@ class Conversation(Base):
     last_updated = Column(DateTime, nullable=False)
     participant_count = Column(Integer, nullable=False)
     date = Column(Date, nullable=False)
+    # content_hash of the content last vectorized successfully, if any
+    vectorized_hash = Column(String, nullable=True)
 
     def __repr__(self):
         return f"<Conversation(thread_ts={self.thread_ts}, channel={self.channel_name})>"
 
-    def to_data_model(self) -> ConversationData:
-        """Convert to ConversationData model."""
-        return ConversationData.model_validate(self)
+    @staticmethod
+    def row_from_data_model(data: ConversationData) -> Dict[str, Any]:
+        """
+        Get the column values of a ConversationData model.
+
+        Fields are read directly rather than through model_dump(), which walks
+        and copies every field of the model.
+        """
+        return {
+            "thread_ts": data.thread_ts,
+            "channel_id": data.channel_id,
+            "channel_name": data.channel_name,
+            "content_hash": data.content_hash,
+            "content": data.content,
+            "last_updated": data.last_updated,
+            "participant_count": data.participant_count,
+            "date": data.date,
+        }
+
+    @classmethod
+    def from_data_model(cls, data: ConversationData) -> "Conversation":
+        """Create from a ConversationData model."""
+        return cls(**cls.row_from_data_model(data))
 
 class ProcessedDay(Base):
     """Model for tracking processed days."""
     __tablename__ = "processed_days"
+    __table_args__ = (
+        # Also serves lookups by channel and date range
+        PrimaryKeyConstraint("channel_id", "date"),
+    )
 
-    id = Column(String, primary_key=True)  # Composite of channel_id + date
     channel_id = Column(String, nullable=False)
     channel_name = Column(String, nullable=False)  # Added for readability
     date = Column(Date, nullable=False)
@@ -61,6 +116,70 @@ class ProcessedDay(Base):
     def __repr__(self):
         return f"<ProcessedDay(channel={self.channel_name}, date={self.date})>"
 
+def _as_date(value: Union[datetime, date_type]) -> date_type:
+    """Truncate a datetime to its date, leaving dates unchanged."""
+    return value.date() if isinstance(value, datetime) else value
+
+def _migrate_conversations(engine) -> None:
+    """
+    Add the vectorized_hash column to a conversations table that lacks it.
+
+    Existing rows start without a vectorized hash, and their documents'
+    date metadata is now the day rather than the message time. Every
+    pre-existing conversation on an already processed day in the requested
+    range is therefore re-embedded on the first run after the migration.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(Conversation.__tablename__):
+        return
+    if "vectorized_hash" in {column["name"] for column in inspector.get_columns(Conversation.__tablename__)}:
+        return
+
+    logger.info("Adding vectorized_hash to conversations")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE conversations ADD COLUMN vectorized_hash VARCHAR")
+
+def _migrate_processed_days(engine) -> None:
+    """
+    Rebuild a processed_days table that still has the string id primary key.
+
+    Earlier versions keyed processed days by a "<channel_id>_<YYYY-MM-DD>"
+    string. SQLite cannot change a primary key in place, so there the rows
+    are copied into a new table keyed by (channel_id, date); other databases
+    drop the id column, which takes its primary key constraint with it, and
+    add the new key.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(ProcessedDay.__tablename__):
+        return
+    if "id" not in {column["name"] for column in inspector.get_columns(ProcessedDay.__tablename__)}:
+        return
+
+    logger.info("Migrating processed_days to a (channel_id, date) primary key")
+    with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("ALTER TABLE processed_days RENAME TO processed_days_old")
+            ProcessedDay.__table__.create(connection)
+            connection.exec_driver_sql(
+                "INSERT INTO processed_days (channel_id, channel_name, date, processed_at) "
+                "SELECT channel_id, channel_name, date, processed_at FROM processed_days_old"
+            )
+            connection.exec_driver_sql("DROP TABLE processed_days_old")
+        else:
+            connection.exec_driver_sql("ALTER TABLE processed_days DROP COLUMN id")
+            connection.exec_driver_sql(
+                "ALTER TABLE processed_days ADD PRIMARY KEY (channel_id, date)"
+            )
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 class ConversationStore:
     """
     Manages storage and retrieval of Slack conversations in SQLite.
@@ -73,49 +192,152 @@ class ConversationStore:
         Args:
             database_url: SQLAlchemy database URL
         """
-        self.engine = create_engine(database_url)
+        # Check pooled connections before use and replace them periodically,
+        # so dropped server connections don't surface as query errors
+        self.engine = create_engine(
+            database_url, pool_pre_ping=True, pool_recycle=1800
+        )
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        _migrate_conversations(self.engine)
+        _migrate_processed_days(self.engine)
         Base.metadata.create_all(self.engine)
+
+        # create_all skips the indexes of tables that already exist, so add
+        # any new ones to pre-existing databases
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         self.Session = sessionmaker(bind=self.engine)
 
-    def _compute_content_hash(self, content: str) -> str:
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Provide a session for a unit of work.
+
+        The session is committed when the block completes, rolled back if it
+        raises, and closed in either case.
+
+        Yields:
+            Database session
+        """
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _compute_content_hash(self, content: Union[str, bytes]) -> str:
         """
         Compute a Blake3 hash of conversation content.
 
+        Large contents are hashed with multiple threads.
+
         Args:
-            content: Conversation content to hash
+            content: Conversation content to hash, as text or UTF-8 bytes
 
         Returns:
             Hash of the content
         """
-        return blake3.blake3(content.encode()).hexdigest()
+        data = content.encode() if isinstance(content, str) else content
+        if len(data) > MULTITHREADED_HASH_THRESHOLD:
+            return blake3.blake3(data, max_threads=blake3.blake3.AUTO).hexdigest()
+        return blake3.blake3(data).hexdigest()
 
-    def _create_day_id(self, channel_id: str, date: datetime) -> str:
+    def _compute_content_hashes(self, contents: List[Union[str, bytes]]) -> List[str]:
         """
-        Create a unique ID for a processed day.
+        Compute Blake3 hashes of many conversation contents.
+
+        Contents are hashed in order; single contents above
+        MULTITHREADED_HASH_THRESHOLD use multiple threads as in
+        _compute_content_hash.
 
         Args:
-            channel_id: Channel ID
-            date: Date to process
+            contents: Conversation contents to hash, as text or UTF-8 bytes
 
         Returns:
-            Unique ID combining channel and date
+            Hashes of the contents, in the same order
         """
-        return f"{channel_id}_{date.strftime('%Y-%m-%d')}"
+        return [self._compute_content_hash(content) for content in contents]
 
-    def is_day_processed(self, session: Session, channel_id: str, date: datetime) -> bool:
+    def get_processed_days(
+        self,
+        session: Session,
+        channel_ids: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Set[date_type]]:
         """
-        Check if a specific day has been processed for a channel.
+        Get the processed days of several channels within a date range.
+
+        All channels are looked up with a single query, served from the
+        (channel_id, date) primary key.
 
         Args:
             session: Database session
-            channel_id: Channel ID
-            date: Date to check
+            channel_ids: Channel IDs to look up
+            start_date: Optional start of the range (inclusive)
+            end_date: Optional end of the range (exclusive)
 
         Returns:
-            True if the day has been processed
+            Mapping of channel ID to its set of processed dates
+        """
+        processed_days = {channel_id: set() for channel_id in channel_ids}
+        channel_ids = list(channel_ids)
+        stmt = lambda_stmt(
+            lambda: select(ProcessedDay.channel_id, ProcessedDay.date).where(
+                ProcessedDay.channel_id.in_(channel_ids)
+            )
+        )
+        if start_date:
+            first_day = _as_date(start_date)
+            stmt += lambda s: s.where(ProcessedDay.date >= first_day)
+        if end_date:
+            end_day = _as_date(end_date)
+            stmt += lambda s: s.where(ProcessedDay.date < end_day)
+
+        for row in session.execute(stmt):
+            processed_days[row.channel_id].add(row.date)
+        return processed_days
+
+    def _upsert(
+        self,
+        session: Session,
+        model,
+        rows: List[Dict],
+    ):
         """
-        day_id = self._create_day_id(channel_id, date)
-        return session.query(ProcessedDay).filter(ProcessedDay.id == day_id).first() is not None
+        Insert rows, updating the existing ones, with a single statement.
+
+        Args:
+            session: Database session
+            model: Mapped model class to write to
+            rows: Column values of the rows to write
+
+        Returns:
+            The statement result, or None if the database has no upsert
+            support and nothing was executed
+        """
+        insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            return None
+
+        # Conflicts are detected on the primary key, which is never updated
+        key_columns = model.__table__.primary_key.columns
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column not in key_columns
+            },
+        )
+        return session.execute(stmt)
 
     def mark_day_processed(
         self, 
@@ -133,61 +355,165 @@ class ConversationStore:
             date: Date to mark as processed
             channel_name: Name of the channel for readability
         """
-        day_id = self._create_day_id(channel_id, date)
-        processed_day = ProcessedDay(
-            id=day_id,
-            channel_id=channel_id,
-            channel_name=channel_name,  # Use provided channel name
-            date=date,
-            processed_at=datetime.now(timezone.utc)
-        )
+        self.mark_days_processed(session, [(channel_id, date, channel_name)])
+
+    def mark_days_processed(
+        self,
+        session: Session,
+        days: List[Tuple[str, datetime, str]]
+    ) -> None:
+        """
+        Mark many channel days as processed with a single statement.
+
+        The changes are not committed; the caller's session_scope owns the
+        transaction.
+
+        Args:
+            session: Database session
+            days: (channel ID, date, channel name) tuples of the days to mark
+        """
+        if not days:
+            return
+
+        # Keep the last occurrence of each day so one statement never
+        # touches the same row twice
+        now = datetime.now(timezone.utc)
+        processed_day_rows = {
+            (channel_id, _as_date(date)): dict(
+                channel_id=channel_id,
+                channel_name=channel_name,  # Use provided channel name
+                date=_as_date(date),
+                processed_at=now
+            )
+            for channel_id, date, channel_name in days
+        }
+        rows = list(processed_day_rows.values())
         try:
-            session.merge(processed_day)
-            session.commit()
+            if self._upsert(session, ProcessedDay, rows) is None:
+                for row in rows:
+                    session.merge(ProcessedDay(**row))
         except Exception as e:
-            session.rollback()
-            logger.error(f"Error marking day as processed: {str(e)}")
+            logger.error(f"Error marking days as processed: {str(e)}")
             raise
 
-    def store_conversation(
+    def bulk_upsert_conversations(
         self,
         session: Session,
-        conversation: ConversationData
-    ) -> bool:
+        conversations: List[ConversationData]
+    ) -> List[ConversationData]:
         """
-        Store or update a conversation in the database.
+        Store or update many conversations with a single statement.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL and
+        falls back to per-row merges on other databases. The changes are not
+        committed; the caller's session_scope owns the transaction.
 
         Args:
             session: Database session
-            conversation: ConversationData instance containing conversation data
+            conversations: ConversationData instances to store
 
         Returns:
-            True if the conversation was updated, False if unchanged
+            The conversations that need vectorizing: those inserted or
+            changed, and unchanged ones whose content was never vectorized
+            successfully (see mark_vectorized)
         """
-        content_hash = self._compute_content_hash(conversation.content)
-        
-        existing = session.query(Conversation).filter(
-            Conversation.thread_ts == conversation.thread_ts
-        ).first()
+        # Keep the last occurrence of each thread so one statement never
+        # touches the same row twice
+        by_thread = {conversation.thread_ts: conversation for conversation in conversations}
+        if not by_thread:
+            return []
+
+        # Lambda statements are compiled once and only rebind the values
+        thread_ts_values = list(by_thread)
+        existing_hashes = {
+            row.thread_ts: row
+            for row in session.execute(lambda_stmt(
+                lambda: select(
+                    Conversation.thread_ts,
+                    Conversation.content_hash,
+                    Conversation.vectorized_hash,
+                ).where(Conversation.thread_ts.in_(thread_ts_values))
+            ))
+        }
+
+        # Hash all contents without a precomputed hash at once
+        to_hash = [
+            conversation for conversation in by_thread.values()
+            if conversation.content_hash is None
+        ]
+        computed_hashes = dict(zip(
+            (conversation.thread_ts for conversation in to_hash),
+            self._compute_content_hashes([conversation.content for conversation in to_hash]),
+        ))
+
+        changed = []
+        pending = []
+        now = datetime.now(timezone.utc)
+        for conversation in by_thread.values():
+            content_hash = conversation.content_hash or computed_hashes[conversation.thread_ts]
+            conversation.content_hash = content_hash
+            existing = existing_hashes.get(conversation.thread_ts)
+            if existing is not None and existing.content_hash == content_hash:
+                # Stored already, but a failed vectorization must be retried
+                if existing.vectorized_hash != content_hash:
+                    pending.append(conversation)
+                continue
+
+            # Add computed fields
+            conversation.last_updated = now
+            changed.append(conversation)
+
+        if not changed:
+            return pending
+
+        rows = [Conversation.row_from_data_model(conversation) for conversation in changed]
 
-        if existing and existing.content_hash == content_hash:
-            return False
+        try:
+            if self._upsert(session, Conversation, rows) is None:
+                for conversation in changed:
+                    session.merge(Conversation.from_data_model(conversation))
+            return changed + pending
+        except Exception as e:
+            logger.error(f"Error storing conversations: {str(e)}")
+            raise
 
-        # Add computed fields
-        conversation.content_hash = content_hash
-        conversation.last_updated = datetime.now(timezone.utc)
+    def mark_vectorized(
+        self,
+        session: Session,
+        conversations: List[ConversationData]
+    ) -> None:
+        """
+        Record that conversations were vectorized successfully.
 
-        # Convert to dict for SQLAlchemy
-        conversation_dict = conversation.model_dump()
-        conversation_model = Conversation(**conversation_dict)
+        A conversation whose content changed in the meantime keeps its old
+        vectorized hash, so the new content is still picked up. The changes
+        are not committed; the caller's session_scope owns the transaction.
 
+        Args:
+            session: Database session
+            conversations: Vectorized ConversationData instances
+        """
+        params = [
+            {"b_thread_ts": conversation.thread_ts, "b_content_hash": conversation.content_hash}
+            for conversation in conversations
+            if conversation.content_hash is not None
+        ]
+        if not params:
+            return
+
+        table = Conversation.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.thread_ts == bindparam("b_thread_ts"),
+                table.c.content_hash == bindparam("b_content_hash"),
+            )
+            .values(vectorized_hash=bindparam("b_content_hash"))
+        )
         try:
-            session.merge(conversation_model)
-            session.commit()
-            return True
+            session.connection().execute(stmt, params)
         except Exception as e:
-            session.rollback()
-            logger.error(f"Error storing conversation: {str(e)}")
+            logger.error(f"Error marking conversations as vectorized: {str(e)}")
             raise
 
     def get_conversations(
@@ -195,27 +521,55 @@ class ConversationStore:
         session: Session,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        channel_id: Optional[str] = None
-    ) -> List[ConversationData]:
+        channel_id: Optional[str] = None,
+        batch_size: int = 256,
+        unvectorized_only: bool = False,
+    ) -> Iterator[ConversationData]:
         """
-        Retrieve conversations within a date range.
+        Stream conversations within a date range.
+
+        Rows are fetched from the database in batches without loading ORM
+        objects, so the session must stay open while the result is consumed
+        but does not grow with it.
 
         Args:
             session: Database session
             start_date: Start date for filtering
             end_date: End date for filtering
             channel_id: Optional channel ID to filter by
+            batch_size: Number of rows fetched per round-trip
+            unvectorized_only: Only return conversations whose current
+                content has not been vectorized successfully
 
-        Returns:
-            List of ConversationData instances
+        Yields:
+            ConversationData instances
         """
-        query = session.query(Conversation)
-
+        # The date column holds dates; comparing it against datetimes would
+        # compare "YYYY-MM-DD" with "YYYY-MM-DD HH:MM:SS" on SQLite
+        conditions = []
         if start_date:
-            query = query.filter(Conversation.date >= start_date)
+            conditions.append(Conversation.date >= _as_date(start_date))
         if end_date:
-            query = query.filter(Conversation.date < end_date)
+            conditions.append(Conversation.date < _as_date(end_date))
         if channel_id:
-            query = query.filter(Conversation.channel_id == channel_id)
-
-        return [conversation.to_data_model() for conversation in query.all()]
+            conditions.append(Conversation.channel_id == channel_id)
+        if unvectorized_only:
+            conditions.append(or_(
+                Conversation.vectorized_hash.is_(None),
+                Conversation.vectorized_hash != Conversation.content_hash,
+            ))
+
+        # Core query: rows come back as plain mappings, skipping ORM object
+        # construction and the session's identity map entirely
+        columns = [
+            column for column in Conversation.__table__.columns
+            if column.key in ConversationData.model_fields
+        ]
+        stmt = select(*columns).where(and_(True, *conditions))
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        for row in result.mappings():
+            # The database already enforces the column types, so skip
+            # validation; only the date column needs widening to a datetime
+            yield ConversationData.model_construct(
+                **{**row, "date": datetime.combine(row["date"], datetime.min.time())}
+            )
@@ -1,16 +1,28 @@
 """
 Logging utilities for the application.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
 import colorlog
 
+# The log format uses neither thread nor process names, so skip collecting
+# them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 
 def setup_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Set up a colored logger instance.
+
+    Records are handed to a queue and formatted and written to stdout by a
+    background listener thread, so logging never blocks on terminal output.
     
     Args:
         name: Logger name (defaults to root logger if None)
@@ -38,7 +50,13 @@ def setup_logger(name: Optional[str] = None) -> logging.Logger:
         )
     )
     
-    logger.addHandler(handler)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    # Flush the remaining records on exit
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     logger.setLevel(logging.INFO)
     
     return logger